@@ -1,418 +1,551 @@
-import sqlite3
-import csv
-import os
-import hashlib
-import sys
-import difflib
-from datetime import datetime
-from pathlib import Path
-from collections import defaultdict
-
-# --- IMPORT OFFICIAL TOPICS ---
-try:
-    # Requires make_italian_datasets.py to be in the same directory
-    from make_italian_datasets import TOPICS_BY_LEVEL
-except ImportError:
-    print("❌ Error: Could not import 'make_italian_datasets.py'.")
-    print("Please ensure this script is in the same folder as your generator.")
-    sys.exit(1)
-
-# Configuration
-DB_NAME = "italian_quiz.db"
-DATA_DIR = Path("data")
-LEVELS = ["A1", "A2", "B1", "B2", "C1"]
-REPORT_FILE = "SETUP_REPORT.txt"
-
-def get_db_connection():
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def normalize_topic(dirty_topic, level):
-    """
-    Maps a messy CSV topic to the official canonical list using fuzzy matching.
-    """
-    if not dirty_topic:
-        return None
-
-    dirty_topic = dirty_topic.strip()
-    official_list = TOPICS_BY_LEVEL.get(level, [])
-    
-    # 1. Exact match
-    if dirty_topic in official_list:
-        return dirty_topic
-        
-    # 2. Fuzzy match
-    matches = difflib.get_close_matches(dirty_topic, official_list, n=1, cutoff=0.4)
-    if matches:
-        return matches[0]
-    
-    return None # Returns None if no plausible official topic is found
-
-def create_schema():
-    print("1. Creating database structure (9 tables)...")
-    
-    # WARNING: This deletes the existing database file!
-    try:
-        os.remove(DB_NAME)
-    except OSError:
-        pass
-
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # --- TABLE 1: QUESTIONS (Content) ---
-    # Kept your new schema's columns: hash_id, complete_sentence, etc.
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS questions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        complete_sentence TEXT NOT NULL,
-        question_text TEXT NOT NULL,
-        english_translation TEXT NOT NULL,
-        hint TEXT,
-        alternate_correct_responses TEXT,
-        option_a TEXT NOT NULL,
-        option_b TEXT NOT NULL,
-        option_c TEXT NOT NULL,
-        option_d TEXT NOT NULL,
-        correct_option TEXT NOT NULL,
-        cefr_level TEXT NOT NULL,
-        topic TEXT NOT NULL,
-        explanation TEXT,
-        resource TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        hash_id TEXT UNIQUE
-    )
-    ''')
-    
-    # --- TABLE 2: ENHANCED PERFORMANCE (User Stats) ---
-    # Kept your new schema's performance tracking columns
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS enhanced_performance (
-        question_id INTEGER PRIMARY KEY,
-        correct_count INTEGER DEFAULT 0,
-        incorrect_count INTEGER DEFAULT 0,
-        partial_correct_count INTEGER DEFAULT 0,
-        freeform_correct_count INTEGER DEFAULT 0,
-        
-        last_seen TIMESTAMP, 
-        
-        last_answered_at TIMESTAMP,
-        next_review_at TIMESTAMP,
-        mastery_level REAL DEFAULT 0.0,
-        history_string TEXT DEFAULT '',
-        FOREIGN KEY (question_id) REFERENCES questions (id)
-    )
-    ''')
-    
-    # --- TABLE 3: TOPIC PERFORMANCE (CRITICAL FIX) ---
-    # Copied from the old script to fix 'no such table' error
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS topic_performance (
-        topic TEXT,
-        cefr_level TEXT,
-        correct_count INTEGER DEFAULT 0,
-        incorrect_count INTEGER DEFAULT 0,
-        last_updated TIMESTAMP,
-        PRIMARY KEY (topic, cefr_level)
-    )
-    ''')
-
-    # --- TABLE 4: USER PROGRESS (CRITICAL FIX) ---
-    # Copied from the old script
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS user_progress (
-        id INTEGER PRIMARY KEY,
-        estimated_level TEXT DEFAULT 'A1',
-        total_questions_answered INTEGER DEFAULT 0,
-        last_assessment TIMESTAMP,
-        level_confidence REAL DEFAULT 0.5
-    )
-    ''')
-
-    # --- TABLE 5: LEVEL STATS (CRITICAL FIX) ---
-    # Copied from the old script
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS level_stats (
-        level TEXT PRIMARY KEY,
-        history TEXT NOT NULL
-    )
-    ''')
-
-    # --- TABLE 6: QUIZ HISTORY (CRITICAL FIX) ---
-    # Copied from the old script
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS quiz_history (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        timestamp DATETIME NOT NULL,
-        score INTEGER NOT NULL,
-        total_questions INTEGER NOT NULL,
-        session_id TEXT
-    )
-    ''')
-
-    # --- TABLE 7: DETAILED ANSWER HISTORY (CRITICAL FIX) ---
-    # Copied from the old script
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS answer_history (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        question_id INTEGER,
-        user_answer TEXT,
-        correct_answer TEXT,
-        is_correct BOOLEAN,
-        timestamp DATETIME,
-        quiz_session_id TEXT,
-        cefr_level TEXT NOT NULL,
-        FOREIGN KEY (question_id) REFERENCES questions (id)
-    )
-    ''')
-
-    # --- TABLE 8: DAILY STATS (CRITICAL FIX) ---
-    # Copied from the old script
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS daily_stats (
-        date DATE PRIMARY KEY,
-        total_coverage REAL DEFAULT 0,
-        total_mastery REAL DEFAULT 0,
-        last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
-    )
-    ''')
-
-    # --- TABLE 9: QUESTION UPDATE LOG (CRITICAL FIX) ---
-    # Copied from the old script
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS question_update_log (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        question_hash TEXT NOT NULL,
-        old_question_id INTEGER,
-        new_question_id INTEGER,
-        update_type TEXT NOT NULL,
-        timestamp DATETIME,
-        notes TEXT
-    )
-    ''')
-    
-    # Create indices for performance
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_level_topic ON questions(cefr_level, topic)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_perf_question_id ON enhanced_performance(question_id)')
-    # Index from old script
-    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_question_hash ON questions(hash_id)')
-
-    
-    conn.commit()
-    conn.close()
-    print("Database structure created successfully (Questions + 8 support tables).\n")
-
-def find_csv_file(level):
-    """
-    Searches for the CSV file by checking both capitalized and lowercase filenames,
-    and also checks the current folder if the 'data' folder isn't found/used.
-    """
-    search_filename_cap = f"Italian_{level}.csv"
-    search_filename_low = f"italian_{level}.csv"
-    
-    # Search paths: 1. data/ subfolder, 2. Current folder
-    search_dirs = [Path("data"), Path(".")]
-    
-    for folder in search_dirs:
-        if not folder.exists():
-            continue
-        
-        # Check capitalized version first (Italian_A1.csv)
-        path_cap = folder / search_filename_cap
-        if path_cap.exists():
-            return path_cap
-            
-        # Check lowercase version (italian_A1.csv)
-        path_low = folder / search_filename_low
-        if path_low.exists():
-            return path_low
-            
-    return None
-
-def populate_database():
-    print("2. Populating with questions from CSV files...")
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    total_added = 0
-    total_skipped_dupe = 0
-    total_errors = 0
-    topics_normalized_count = 0
-    
-    seen_hashes = set()
-    
-    for level in LEVELS:
-        csv_path = find_csv_file(level)
-        
-        if not csv_path:
-            print(f"Skipping {level}: CSV file not found.")
-            continue
-            
-        print(f"Processing '{csv_path}'...")
-        
-        added_this_level = 0
-        errors_this_level = 0
-        dupes_this_level = 0
-        
-        try:
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                
-                for row_num, row in enumerate(reader, 1):
-                    # 1. Basic Validation
-                    required = ['question_text', 'correct_option', 'option_a', 'topic']
-                    if any(not row.get(field) for field in required):
-                        errors_this_level += 1
-                        continue
-
-                    # 2. Validate Correct Option
-                    correct = row['correct_option'].strip().upper()
-                    if correct not in ['A', 'B', 'C', 'D']:
-                        errors_this_level += 1
-                        continue
-
-                    # 3. Generate Hash (Prevent Duplicates) - Using your new script's simpler hash
-                    q_text = row['question_text'].strip()
-                    content_hash = hashlib.md5(f"{level}:{q_text}".encode()).hexdigest()[:16]
-                    
-                    if content_hash in seen_hashes:
-                        dupes_this_level += 1
-                        continue
-                    seen_hashes.add(content_hash)
-
-                    # 4. NORMALIZE TOPIC
-                    original_topic = row['topic'].strip()
-                    clean_topic = normalize_topic(original_topic, level)
-                    
-                    if original_topic != clean_topic:
-                        topics_normalized_count += 1
-
-                    if not clean_topic: # Skip if the topic could not be normalized (unrecognized)
-                        errors_this_level += 1
-                        continue
-
-                    # 5. Insert Question
-                    try:
-                        current_time = datetime.now().isoformat()
-                        
-                        cursor.execute('''
-                            INSERT INTO questions (
-                                complete_sentence, question_text, english_translation,
-                                hint, alternate_correct_responses,
-                                option_a, option_b, option_c, option_d,
-                                correct_option, cefr_level, topic,
-                                explanation, resource, hash_id
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ''', (
-                            row.get('complete_sentence', '').strip(),
-                            q_text,
-                            row.get('english_translation', '').strip(),
-                            row.get('hint', '').strip(),
-                            row.get('alternate_correct_responses', '').strip(),
-                            row.get('option_a', '').strip(),
-                            row.get('option_b', '').strip(),
-                            row.get('option_c', '').strip(),
-                            row.get('option_d', '').strip(),
-                            correct,
-                            level,
-                            clean_topic,
-                            row.get('explanation', '').strip(),
-                            row.get('resource', '').strip(),
-                            content_hash
-                        ))
-                        
-                        # 6. Initialize Performance Record (Empty)
-                        question_id = cursor.lastrowid
-                        # Only insert question_id, all other columns use their default (0/NULL)
-                        cursor.execute('''
-                            INSERT INTO enhanced_performance (question_id) VALUES (?)
-                        ''', (question_id,))
-                        
-                        # Initialize User Progress (if not done already - safe to ignore if running multiple times)
-                        cursor.execute("INSERT OR IGNORE INTO user_progress (id) VALUES (1)")
-                        
-                        # Initialize Topic Performance (Optional, but safe to do here)
-                        cursor.execute('''
-                            INSERT OR IGNORE INTO topic_performance (topic, cefr_level) VALUES (?, ?)
-                        ''', (clean_topic, level))
-                        
-                        # Log the creation
-                        cursor.execute('''
-                        INSERT INTO question_update_log 
-                        (question_hash, new_question_id, update_type, timestamp, notes)
-                        VALUES (?, ?, ?, ?, ?)
-                        ''', (content_hash, question_id, 'created', 
-                             current_time, f'Initial load from {csv_path} row {row_num}'))
-                        
-                        added_this_level += 1
-                    except Exception as e:
-                        print(f"Error inserting row {row_num}: {e}")
-                        errors_this_level += 1
-        
-        except Exception as e:
-             print(f"Fatal error during processing '{csv_path}': {e}")
-             errors_this_level = 999 # Indicate major failure
-             
-        print(f"  Added {added_this_level} questions from '{csv_path}' ({errors_this_level} errors, {dupes_this_level} duplicates skipped)")
-        
-        total_added += added_this_level
-        total_errors += errors_this_level
-        total_skipped_dupe += dupes_this_level
-
-    conn.commit()
-    conn.close()
-    
-    print("\nDatabase population complete!")
-    print(f"Total questions added: {total_added}")
-    print(f"Topics auto-corrected: {topics_normalized_count}")
-
-def verify_and_report():
-    print("3. Verifying database and generating report...")
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    report_lines = []
-    
-    # Verify Performance Table Count
-    cursor.execute("SELECT COUNT(*) as count FROM enhanced_performance")
-    perf_count = cursor.fetchone()['count']
-    print(f"Performance Records Initialized: {perf_count}")
-    
-    # Topic Consistency Check (Proof that normalization worked)
-    print("\nTopic Coverage (Comparing against official list):")
-    total_unique_db_topics = 0
-    
-    for level in LEVELS:
-        official_topics = set(TOPICS_BY_LEVEL.get(level, []))
-        cursor.execute("SELECT DISTINCT topic FROM questions WHERE cefr_level = ?", (level,))
-        db_topics = set(row['topic'] for row in cursor.fetchall())
-        
-        total_unique_db_topics += len(db_topics)
-        
-        extra_topics = db_topics - official_topics
-        status = "✓" if not extra_topics else "!"
-        msg = f"  {status} {level}: {len(db_topics)} topics found (Expected: {len(official_topics)})"
-        print(msg)
-        report_lines.append(msg)
-        
-    print(f"\nTotal unique topics in DB: {total_unique_db_topics}")
-    
-    # Save Report
-    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(report_lines))
-    
-    print(f"\nReport generated: {REPORT_FILE}")
-    conn.close()
-
-if __name__ == "__main__":
-    print("ITALIAN QUIZ - NEW DATABASE SETUP (FIXED SCHEMA)")
-    print("============================================================")
-    
-    create_schema()
-    populate_database()
-    verify_and_report()
-    
-    print("============================================================")
-    print("✅ SUCCESS! New database 'italian_quiz.db' is ready to use.")
+import sqlite3
+import csv
+import os
+import hashlib
+import sys
+import difflib
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Optional: rapidfuzz does the same Ratcliff/Obershelp-style scoring as
+# difflib but in C, which matters when many CSV topics need fuzzy repair
+try:
+    from rapidfuzz import process as _rf_process, fuzz as _rf_fuzz
+except ImportError:
+    _rf_process = None
+
+# --- IMPORT OFFICIAL TOPICS ---
+try:
+    # Requires make_italian_datasets.py to be in the same directory
+    from make_italian_datasets import TOPICS_BY_LEVEL
+except ImportError:
+    print("❌ Error: Could not import 'make_italian_datasets.py'.")
+    print("Please ensure this script is in the same folder as your generator.")
+    sys.exit(1)
+
+# Configuration
+DB_NAME = "italian_quiz.db"
+DATA_DIR = Path("data")
+LEVELS = ("A1", "A2", "B1", "B2", "C1")
+REPORT_FILE = "SETUP_REPORT.txt"
+
+# Casefolded topic -> canonical topic, per level, built once at import time.
+# Lets normalize_topic() resolve the common already-correct case with a
+# single dict lookup instead of a linear scan plus difflib.
+_OFFICIAL_TOPICS = {
+    lvl: {t.casefold(): t for t in TOPICS_BY_LEVEL.get(lvl, [])}
+    for lvl in LEVELS
+}
+
+# Frozen per-level topic sets for membership checks in the coverage report
+TOPIC_SETS_BY_LEVEL = {
+    lvl: frozenset(TOPICS_BY_LEVEL.get(lvl, []))
+    for lvl in LEVELS
+}
+
+# CSV columns read positionally in populate_database(), in the order the
+# INSERT expects them (question_text, correct_option and topic are handled
+# separately because they need extra processing/validation).
+CSV_FIELDS = [
+    'complete_sentence', 'english_translation', 'hint',
+    'alternate_correct_responses', 'option_a', 'option_b',
+    'option_c', 'option_d', 'explanation', 'resource'
+]
+
+
+# SQL used by the import, lifted to module constants so every execute call
+# passes the same interned string and hits sqlite3's statement cache.
+_SQL_INSERT_QUESTION = '''
+    INSERT INTO questions (
+        complete_sentence, question_text, english_translation,
+        hint, alternate_correct_responses,
+        option_a, option_b, option_c, option_d,
+        correct_option, cefr_level, topic,
+        explanation, resource, hash_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INIT_PERFORMANCE = '''
+    INSERT OR IGNORE INTO enhanced_performance (question_id)
+    SELECT id FROM questions
+'''
+
+_SQL_INIT_TOPIC_PERF = '''
+    INSERT OR IGNORE INTO topic_performance (topic, cefr_level)
+    SELECT DISTINCT topic, cefr_level FROM questions
+'''
+
+_SQL_LOG_CREATED = '''
+    INSERT INTO question_update_log
+    (question_hash, new_question_id, update_type, timestamp, notes)
+    SELECT hash_id, id, 'created', ?, 'Initial load from ' || cefr_level || ' CSV'
+    FROM questions
+'''
+
+def get_db_connection():
+    conn = sqlite3.connect(DB_NAME)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def normalize_topic(dirty_topic, level):
+    """
+    Maps a messy CSV topic to the official canonical list using fuzzy matching.
+    """
+    if not dirty_topic:
+        return None
+
+    dirty_topic = dirty_topic.strip()
+
+    # 1. Exact match (case-insensitive, O(1) dict probe)
+    exact = _OFFICIAL_TOPICS.get(level, {}).get(dirty_topic.casefold())
+    if exact is not None:
+        return exact
+
+    # 2. Fuzzy match (memoized: the same misspelling recurs across rows)
+    return _fuzzy_topic(dirty_topic, level)
+
+@lru_cache(maxsize=8192)
+def _fuzzy_topic(dirty_topic, level):
+    """
+    difflib fallback for normalize_topic. get_close_matches runs a
+    SequenceMatcher against every official topic, so cache the verdict
+    per (topic, level) — CSVs repeat the same dirty strings constantly.
+    """
+    official_list = TOPICS_BY_LEVEL.get(level, [])
+    if _rf_process is not None:
+        match = _rf_process.extractOne(
+            dirty_topic, official_list, scorer=_rf_fuzz.WRatio, score_cutoff=40)
+        return match[0] if match else None
+    matches = difflib.get_close_matches(dirty_topic, official_list, n=1, cutoff=0.4)
+    if matches:
+        return matches[0]
+
+    return None # Returns None if no plausible official topic is found
+
+def create_schema():
+    print("1. Creating database structure (9 tables)...")
+    
+    # WARNING: This deletes the existing database file!
+    try:
+        os.remove(DB_NAME)
+    except OSError:
+        pass
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    # --- TABLE 1: QUESTIONS (Content) ---
+    # Kept your new schema's columns: hash_id, complete_sentence, etc.
+    # Plain INTEGER PRIMARY KEY (no AUTOINCREMENT): SQLite still assigns
+    # increasing rowids but skips the sqlite_sequence bookkeeping per insert.
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS questions (
+        id INTEGER PRIMARY KEY,
+        complete_sentence TEXT NOT NULL,
+        question_text TEXT NOT NULL,
+        english_translation TEXT NOT NULL,
+        hint TEXT,
+        alternate_correct_responses TEXT,
+        option_a TEXT NOT NULL,
+        option_b TEXT NOT NULL,
+        option_c TEXT NOT NULL,
+        option_d TEXT NOT NULL,
+        correct_option TEXT NOT NULL,
+        cefr_level TEXT NOT NULL,
+        topic TEXT NOT NULL,
+        explanation TEXT,
+        resource TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        hash_id TEXT UNIQUE
+    )
+    ''')
+    
+    # --- TABLE 2: ENHANCED PERFORMANCE (User Stats) ---
+    # Kept your new schema's performance tracking columns
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS enhanced_performance (
+        question_id INTEGER PRIMARY KEY,
+        correct_count INTEGER DEFAULT 0,
+        incorrect_count INTEGER DEFAULT 0,
+        partial_correct_count INTEGER DEFAULT 0,
+        freeform_correct_count INTEGER DEFAULT 0,
+        
+        last_seen TIMESTAMP, 
+        
+        last_answered_at TIMESTAMP,
+        next_review_at TIMESTAMP,
+        mastery_level REAL DEFAULT 0.0,
+        history_string TEXT DEFAULT '',
+        FOREIGN KEY (question_id) REFERENCES questions (id)
+    )
+    ''')
+    
+    # --- TABLE 3: TOPIC PERFORMANCE (CRITICAL FIX) ---
+    # Copied from the old script to fix 'no such table' error
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS topic_performance (
+        topic TEXT,
+        cefr_level TEXT,
+        correct_count INTEGER DEFAULT 0,
+        incorrect_count INTEGER DEFAULT 0,
+        last_updated TIMESTAMP,
+        PRIMARY KEY (topic, cefr_level)
+    )
+    ''')
+
+    # --- TABLE 4: USER PROGRESS (CRITICAL FIX) ---
+    # Copied from the old script
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS user_progress (
+        id INTEGER PRIMARY KEY,
+        estimated_level TEXT DEFAULT 'A1',
+        total_questions_answered INTEGER DEFAULT 0,
+        last_assessment TIMESTAMP,
+        level_confidence REAL DEFAULT 0.5
+    )
+    ''')
+
+    # --- TABLE 5: LEVEL STATS (CRITICAL FIX) ---
+    # Copied from the old script
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS level_stats (
+        level TEXT PRIMARY KEY,
+        history TEXT NOT NULL
+    )
+    ''')
+
+    # --- TABLE 6: QUIZ HISTORY (CRITICAL FIX) ---
+    # Copied from the old script
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS quiz_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME NOT NULL,
+        score INTEGER NOT NULL,
+        total_questions INTEGER NOT NULL,
+        session_id TEXT
+    )
+    ''')
+
+    # --- TABLE 7: DETAILED ANSWER HISTORY (CRITICAL FIX) ---
+    # Copied from the old script
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS answer_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question_id INTEGER,
+        user_answer TEXT,
+        correct_answer TEXT,
+        is_correct BOOLEAN,
+        timestamp DATETIME,
+        quiz_session_id TEXT,
+        cefr_level TEXT NOT NULL,
+        FOREIGN KEY (question_id) REFERENCES questions (id)
+    )
+    ''')
+
+    # --- TABLE 8: DAILY STATS (CRITICAL FIX) ---
+    # Copied from the old script
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS daily_stats (
+        date DATE PRIMARY KEY,
+        total_coverage REAL DEFAULT 0,
+        total_mastery REAL DEFAULT 0,
+        last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # --- TABLE 9: QUESTION UPDATE LOG (CRITICAL FIX) ---
+    # Copied from the old script
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS question_update_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question_hash TEXT NOT NULL,
+        old_question_id INTEGER,
+        new_question_id INTEGER,
+        update_type TEXT NOT NULL,
+        timestamp DATETIME,
+        notes TEXT
+    )
+    ''')
+    
+    # Create indices for performance
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_level_topic ON questions(cefr_level, topic)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_perf_question_id ON enhanced_performance(question_id)')
+    # Index from old script
+    cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_question_hash ON questions(hash_id)')
+
+    
+    conn.commit()
+    conn.close()
+    print("Database structure created successfully (Questions + 8 support tables).\n")
+
+def _scan_csv_files():
+    """
+    Pre-scans the search folders once with a single glob per directory
+    (one readdir each) instead of four stat calls per level.
+    Search paths: 1. data/ subfolder, 2. Current folder; sorted() keeps the
+    capitalized filename (Italian_A1.csv) preferred over the lowercase one.
+    """
+    found = {}
+    for folder in [Path("data"), Path(".")]:
+        if not folder.exists():
+            continue
+        for path in sorted(folder.glob("[Ii]talian_*.csv")):
+            level = path.stem.split("_", 1)[1].upper()
+            found.setdefault(level, path)
+    return found
+
+ALL_CSV_FILES = _scan_csv_files()
+
+def find_csv_file(level):
+    """Returns the pre-scanned CSV path for a level (None if not found)."""
+    return ALL_CSV_FILES.get(level)
+
+def parse_level_csv(level, csv_path):
+    """
+    Parse one level's CSV in a worker process: validate rows, dedupe within
+    the file, normalize topics and build ready-to-insert value tuples.
+
+    Returns (question_rows, normalized_count, errors, dupes) where
+    question_rows are tuples in the INSERT column order (hash_id last).
+    """
+    question_rows = []
+    seen_hashes = set()
+    normalized_count = 0
+    errors = 0
+    dupes = 0
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return question_rows, normalized_count, errors, dupes
+
+        # Resolve column positions once per file (None = column absent)
+        col = {name: i for i, name in enumerate(header)}
+        i_question = col.get('question_text')
+        i_correct = col.get('correct_option')
+        i_option_a = col.get('option_a')
+        i_topic = col.get('topic')
+        field_indices = [col.get(f) for f in CSV_FIELDS]
+
+        for row_num, row in enumerate(reader, 1):
+            # 1. Basic Validation (required columns present and non-empty)
+            n_cols = len(row)
+            if any(i is None or i >= n_cols or not row[i]
+                   for i in (i_question, i_correct, i_option_a, i_topic)):
+                errors += 1
+                continue
+
+            # 2. Validate Correct Option
+            correct = row[i_correct].strip().upper()
+            if correct not in ['A', 'B', 'C', 'D']:
+                errors += 1
+                continue
+
+            # 3. Generate Hash (Prevent Duplicates) - BLAKE2b-64 content
+            # fingerprint (must stay in sync with update_existing_database).
+            # Dedup on the 64-bit integer form of the digest: int set entries
+            # are smaller and cheaper to probe than 16-char hex strings.
+            q_text = row[i_question].strip()
+            digest = hashlib.blake2b(f"{level}:{q_text}".encode(), digest_size=8).digest()
+            hash_int = int.from_bytes(digest, 'big')
+
+            if hash_int in seen_hashes:
+                dupes += 1
+                continue
+            seen_hashes.add(hash_int)
+            content_hash = digest.hex()
+
+            # 4. NORMALIZE TOPIC
+            original_topic = row[i_topic].strip()
+            clean_topic = normalize_topic(original_topic, level)
+
+            if original_topic != clean_topic:
+                normalized_count += 1
+
+            if not clean_topic: # Skip if the topic could not be normalized (unrecognized)
+                errors += 1
+                continue
+
+            # 5. Build the insert tuple
+            (complete_sentence, english_translation, hint,
+             alternates, option_a, option_b, option_c, option_d,
+             explanation, resource) = [
+                row[i].strip() if i is not None and i < n_cols else ''
+                for i in field_indices
+            ]
+
+            question_rows.append((
+                complete_sentence,
+                q_text,
+                english_translation,
+                hint,
+                alternates,
+                option_a,
+                option_b,
+                option_c,
+                option_d,
+                correct,
+                level,
+                clean_topic,
+                explanation,
+                resource,
+                content_hash
+            ))
+
+    return question_rows, normalized_count, errors, dupes
+
+def populate_database():
+    print("2. Populating with questions from CSV files...")
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    # One explicit transaction around the whole import: a single
+    # BEGIN IMMEDIATE/COMMIT instead of leaving the boundaries to the
+    # sqlite3 module's implicit transaction handling.
+    conn.isolation_level = None
+    cursor.execute("BEGIN IMMEDIATE")
+
+    total_added = 0
+    total_skipped_dupe = 0
+    total_errors = 0
+    topics_normalized_count = 0
+
+    seen_hashes = set()
+    current_time = datetime.now().isoformat()
+
+    level_paths = [(level, find_csv_file(level)) for level in LEVELS]
+
+    # Parse/hash/normalize the five CSVs in parallel worker processes;
+    # only the SQLite writes below stay on this process.
+    with ProcessPoolExecutor(max_workers=len(LEVELS)) as executor:
+        futures = {
+            level: executor.submit(parse_level_csv, level, csv_path)
+            for level, csv_path in level_paths if csv_path
+        }
+
+        for level, csv_path in level_paths:
+            if level not in futures:
+                print(f"Skipping {level}: CSV file not found.")
+                continue
+
+            print(f"Processing '{csv_path}'...")
+
+            try:
+                (question_rows, normalized,
+                 errors_this_level, dupes_this_level) = futures[level].result()
+            except Exception as e:
+                print(f"Fatal error during processing '{csv_path}': {e}")
+                total_errors += 999 # Indicate major failure
+                continue
+
+            # Cross-file dedupe on int keys, then flush in batches (hash_id is last)
+            added_this_level = 0
+            batch = []
+            for values in question_rows:
+                hash_int = int(values[-1], 16)
+                if hash_int in seen_hashes:
+                    dupes_this_level += 1
+                    continue
+                seen_hashes.add(hash_int)
+                batch.append(values)
+                if len(batch) >= 1000:
+                    cursor.executemany(_SQL_INSERT_QUESTION, batch)
+                    added_this_level += len(batch)
+                    batch.clear()
+            if batch:
+                cursor.executemany(_SQL_INSERT_QUESTION, batch)
+                added_this_level += len(batch)
+
+            topics_normalized_count += normalized
+
+            print(f"  Added {added_this_level} questions from '{csv_path}' ({errors_this_level} errors, {dupes_this_level} duplicates skipped)")
+
+            total_added += added_this_level
+            total_errors += errors_this_level
+            total_skipped_dupe += dupes_this_level
+
+    # The dedup set can be large; drop it before the set-based finish/verify
+    seen_hashes.clear()
+    del seen_hashes
+
+    # 6. Initialize Performance Records (Empty) for every inserted question
+    cursor.execute(_SQL_INIT_PERFORMANCE)
+
+    # Initialize User Progress (safe to ignore if running multiple times)
+    cursor.execute("INSERT OR IGNORE INTO user_progress (id) VALUES (1)")
+
+    # Initialize Topic Performance (Optional, but safe to do here)
+    cursor.execute(_SQL_INIT_TOPIC_PERF)
+
+    # Log the creations with a single set-based statement; per-row source
+    # locations are pure audit metadata the bulk path no longer tracks.
+    cursor.execute(_SQL_LOG_CREATED, (current_time,))
+
+    cursor.execute("COMMIT")
+
+    print("\nDatabase population complete!")
+    print(f"Total questions added: {total_added}")
+    print(f"Topics auto-corrected: {topics_normalized_count}")
+
+    # Hand the warm connection to verify_and_report instead of reopening
+    return conn
+
+def verify_and_report(conn=None):
+    print("3. Verifying database and generating report...")
+    if conn is None:
+        conn = get_db_connection()
+    cursor = conn.cursor()
+    
+    report_lines = []
+    
+    # Verify Performance Table Count
+    cursor.execute("SELECT COUNT(*) as count FROM enhanced_performance")
+    perf_count = cursor.fetchone()['count']
+    print(f"Performance Records Initialized: {perf_count}")
+    
+    # Topic Consistency Check (Proof that normalization worked)
+    print("\nTopic Coverage (Comparing against official list):")
+    total_unique_db_topics = 0
+
+    # One grouped scan over idx_level_topic instead of a DISTINCT query per level
+    cursor.execute("SELECT cefr_level, topic FROM questions GROUP BY cefr_level, topic")
+    topics_by_level = defaultdict(set)
+    for row in cursor.fetchall():
+        topics_by_level[row['cefr_level']].add(row['topic'])
+
+    for level in LEVELS:
+        official_topics = TOPIC_SETS_BY_LEVEL[level]
+        db_topics = topics_by_level[level]
+
+        total_unique_db_topics += len(db_topics)
+        
+        extra_topics = db_topics - official_topics
+        status = "✓" if not extra_topics else "!"
+        msg = f"  {status} {level}: {len(db_topics)} topics found (Expected: {len(official_topics)})"
+        print(msg)
+        report_lines.append(msg)
+        
+    print(f"\nTotal unique topics in DB: {total_unique_db_topics}")
+    
+    # Save Report
+    with open(REPORT_FILE, 'w', encoding='utf-8', buffering=1 << 17) as f:
+        f.write('\n'.join(report_lines))
+    
+    print(f"\nReport generated: {REPORT_FILE}")
+    conn.close()
+
+if __name__ == "__main__":
+    print("ITALIAN QUIZ - NEW DATABASE SETUP (FIXED SCHEMA)")
+    print("============================================================")
+    
+    create_schema()
+    conn = populate_database()
+    verify_and_report(conn)
+    
+    print("============================================================")
+    print("✅ SUCCESS! New database 'italian_quiz.db' is ready to use.")
     print("============================================================")
\ No newline at end of file
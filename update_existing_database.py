@@ -14,9 +14,14 @@ Usage: python update_database.py
 
 import sqlite3
 import csv
+import io
+import json
 import os
+import sys
 import hashlib
 import shutil
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
@@ -24,17 +29,125 @@ from pathlib import Path
 DB_FILE = "italian_quiz.db"
 BACKUP_DIR = "backups"
 DATA_DIR = "data"
-LEVELS = ['A1', 'A2', 'B1', 'B2', 'C1']
+LEVELS = ('A1', 'A2', 'B1', 'B2', 'C1')
 REPORT_FILE = "UPDATE_REPORT.txt"
 
+# Read-side statements at module scope: one definition site, and the
+# connection's statement cache reuses the compiled plan across calls
+_SQL_ORPHAN_COUNTS = """
+    SELECT
+        (SELECT COUNT(*) FROM enhanced_performance ep
+         WHERE NOT EXISTS (SELECT 1 FROM questions q WHERE q.id = ep.question_id)),
+        (SELECT COUNT(*) FROM answer_history ah
+         WHERE NOT EXISTS (SELECT 1 FROM questions q WHERE q.id = ah.question_id))
+"""
+
+_SQL_ORPHAN_EXISTS = """
+    SELECT
+        EXISTS (SELECT 1 FROM enhanced_performance ep
+                WHERE NOT EXISTS (SELECT 1 FROM questions q WHERE q.id = ep.question_id)),
+        EXISTS (SELECT 1 FROM answer_history ah
+                WHERE NOT EXISTS (SELECT 1 FROM questions q WHERE q.id = ah.question_id))
+"""
+
+_SQL_REPORT_COUNTS = """
+    SELECT
+        (SELECT COUNT(*) FROM questions),
+        (SELECT COUNT(*) FROM archived_questions),
+        (SELECT COUNT(*) FROM enhanced_performance
+         WHERE correct_count > 0 OR incorrect_count > 0)
+"""
+
+_SQL_PROGRESS_COUNT = """
+    SELECT COUNT(*) FROM enhanced_performance
+    WHERE correct_count > 0 OR incorrect_count > 0
+"""
+
+# Prepared once; every phase that logs through Python binds against this
+_SQL_LOG_INSERT = """
+    INSERT INTO question_update_log
+    (question_hash, old_question_id, new_question_id, update_type, timestamp, notes)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_RECENT_CHANGES = """
+    SELECT timestamp, update_type, question_hash,
+           old_question_id, new_question_id, notes
+    FROM question_update_log
+    ORDER BY timestamp DESC, id DESC
+    LIMIT ?
+"""
+
+# Row template for show_recent_changes, built once at import
+_RECENT_ROW = "  {ts} | {ut:8} | {qh}... | {oid} -> {nid}"
+
+# Banner separator, built once instead of re-running "=" * 70 per line
+SEP = "=" * 70
+
+# Per-row change tracing is opt-in: aggregate counts are always printed,
+# the line-per-question detail only with UPDATE_VERBOSE=1
+VERBOSE = os.environ.get('UPDATE_VERBOSE') == '1' 
+
 def generate_hash(level: str, question_text: str) -> str:
     """
     Generate hash exactly like setup_new_database.py does.
-    Hash = MD5 of "level:question_text" (first 16 chars)
+    Hash = BLAKE2b-64 of "level:question_text" (16 hex chars).
+    BLAKE2b is faster than MD5 and the hash is only a content fingerprint;
+    migrate_hashes() rolls databases created under the old MD5 scheme.
+    """
+    return hashlib.blake2b(f"{level}:{question_text}".encode(), digest_size=8).hexdigest()
+
+# Every field that participates in change detection, in hash/compare order
+CONTENT_FIELDS = ['complete_sentence', 'question_text', 'english_translation', 'hint',
+                  'alternate_correct_responses', 'option_a', 'option_b', 'option_c', 'option_d',
+                  'correct_option', 'cefr_level', 'topic', 'explanation', 'resource']
+
+def generate_content_hash(data: dict) -> str:
+    """
+    64-bit BLAKE2b fingerprint over all comparable fields.
+    Lets change detection compare one stored value instead of 14 strings.
+    """
+    joined = "\x1f".join(data.get(field) or '' for field in CONTENT_FIELDS)
+    return hashlib.blake2b(joined.encode(), digest_size=8).hexdigest()
+
+def migrate_hashes(conn):
+    """
+    One-shot migration: recompute hash_id for rows still carrying the old
+    MD5-based fingerprint so they keep matching CSV rows hashed with
+    generate_hash(), and backfill the stored content_hash used for change
+    detection. No-op once every row is on the BLAKE2b scheme.
     """
-    return hashlib.md5(f"{level}:{question_text}".encode()).hexdigest()[:16]
+    cursor = conn.cursor()
+
+    # Filter in SQL so already-migrated rows never cross the Python
+    # boundary. Legacy MD5 hash_ids are also 16 hex chars, so length can't
+    # tell the schemes apart; the real invariant is that content_hash is
+    # backfilled in the same UPDATE that rolls hash_id, making a NULL
+    # content_hash the marker for a not-yet-migrated row. Re-runs fetch
+    # nothing.
+    cursor.execute("SELECT * FROM questions WHERE content_hash IS NULL")
+    rehashed = []
+    hash_changes = 0
+    for row in cursor.fetchall():
+        data = dict(row)
+        new_hash = generate_hash(data['cefr_level'], data['question_text'])
+        new_content = generate_content_hash(data)
+        if new_hash != data['hash_id']:
+            hash_changes += 1
+        rehashed.append((new_hash, new_content, data['id']))
 
-def create_backup() -> str:
+    if rehashed:
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.executemany(
+            "UPDATE questions SET hash_id = ?, content_hash = ? WHERE id = ?", rehashed)
+        cursor.execute("COMMIT")
+        if hash_changes:
+            print(f"\U0001F511 Migrated {hash_changes} question hashes to the BLAKE2b scheme")
+        backfilled = len(rehashed) - hash_changes
+        if backfilled:
+            print(f"\U0001F511 Backfilled content_hash for {backfilled} questions")
+
+def create_backup(conn) -> str:
     """Create timestamped backup of database."""
     if not os.path.exists(DB_FILE):
         print(f"⚠️  No database file found: {DB_FILE}")
@@ -44,7 +157,18 @@ def create_backup() -> str:
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     backup_file = f"{BACKUP_DIR}/italian_quiz_backup_{timestamp}.db"
     
-    shutil.copy2(DB_FILE, backup_file)
+    # The online backup API snapshots a consistent image even mid-WAL,
+    # which a plain file copy cannot guarantee
+    try:
+        dst = sqlite3.connect(backup_file)
+        with dst:
+            conn.backup(dst, pages=1024)
+        dst.close()
+    except sqlite3.Error as e:
+        # Fall back to a raw copy rather than running without any backup
+        print(f"⚠️  Online backup failed ({e}), falling back to file copy")
+        shutil.copy2(DB_FILE, backup_file)
+    
     print(f"✅ Backup created: {backup_file}")
     return backup_file
 
@@ -62,10 +186,140 @@ def find_csv_files() -> dict:
     
     return files
 
-def load_csv_questions(csv_files: dict) -> dict:
+def _load_one_level(level: str, filepath, db_index: dict = None) -> tuple:
+    """
+    Parse one level's CSV (worker for load_csv_questions, safe to run in a
+    separate process). Returns (level_questions, level_stats).
+    """
+    level_questions = {}
+    stats = {
+        'total_rows': 0,
+        'valid_questions': 0,
+        'skipped_missing_fields': 0,
+        'skipped_invalid_option': 0,
+        'skipped_duplicates': 0
+    }
+    
+    # The "level:" hash prefix is constant per file: hash it once and
+    # .copy() the primed hasher per row instead of rebuilding hasher state
+    # and an f-string for every question
+    base_hasher = hashlib.blake2b(f"{level}:".encode(), digest_size=8)
+    
+    with open(filepath, 'rb', buffering=1 << 20) as fb:
+        # Binary open with a large buffer, decoded in one wrapper: cheaper
+        # than text-mode reads, and csv.reader rows skip the per-row dict
+        # that DictReader builds
+        text = io.TextIOWrapper(fb, encoding='utf-8', newline='')
+        reader = csv.reader(text)
+        
+        header = next(reader, None)
+        if header is None:
+            return level_questions, stats
+        
+        # Resolve column positions once per file (None = column absent)
+        col = {name: i for i, name in enumerate(header)}
+        i_question = col.get('question_text')
+        i_correct = col.get('correct_option')
+        i_option_a = col.get('option_a')
+        i_topic = col.get('topic')
+        field_indices = [col.get(f) for f in (
+            'complete_sentence', 'english_translation', 'hint',
+            'alternate_correct_responses', 'option_a', 'option_b',
+            'option_c', 'option_d', 'topic', 'explanation', 'resource')]
+        
+        # A required column missing from the header invalidates the file;
+        # settle that once so the row loop can use plain comparisons
+        if i_question is None or i_correct is None or i_option_a is None or i_topic is None:
+            for row in reader:
+                stats['total_rows'] += 1
+                stats['skipped_missing_fields'] += 1
+            return level_questions, stats
+        
+        for row in reader:
+            stats['total_rows'] += 1
+            
+            # 1. Basic Validation - same as setup script, but as one flat
+            # branch with no generator allocation per row
+            n_cols = len(row)
+            if (i_question >= n_cols or not row[i_question]
+                    or i_correct >= n_cols or not row[i_correct]
+                    or i_option_a >= n_cols or not row[i_option_a]
+                    or i_topic >= n_cols or not row[i_topic]):
+                stats['skipped_missing_fields'] += 1
+                continue
+            
+            # 2. Validate Correct Option - same as setup script
+            correct = sys.intern(row[i_correct].strip().upper())
+            if correct not in ['A', 'B', 'C', 'D']:
+                stats['skipped_invalid_option'] += 1
+                continue
+            
+            # 3. Generate hash using setup script's method
+            q_text = row[i_question].strip()
+            hasher = base_hasher.copy()
+            hasher.update(q_text.encode())
+            # Interned: these hex keys are compared and hashed in every
+            # later dict lookup, so pointer-equality shortcuts pay off
+            question_hash = sys.intern(hasher.hexdigest())
+            
+            # 4. Skip duplicates within CSV
+            if question_hash in level_questions:
+                stats['skipped_duplicates'] += 1
+                continue
+            
+            # Strip once into a tuple ordered like CONTENT_FIELDS, so the
+            # fingerprint can be computed before deciding whether the
+            # full dict is needed at all
+            (complete_sentence, english_translation, hint, alternates,
+             option_a, option_b, option_c, option_d,
+             topic, explanation, resource) = [
+                row[i].strip() if i is not None and i < n_cols else ''
+                for i in field_indices
+            ]
+            # A handful of distinct topics repeat across thousands of rows:
+            # interning collapses them to one string object apiece
+            topic = sys.intern(topic)
+            values = (
+                complete_sentence,
+                q_text,
+                english_translation,
+                hint,
+                alternates,
+                option_a,
+                option_b,
+                option_c,
+                option_d,
+                correct,
+                level,
+                topic,
+                explanation,
+                resource,
+            )
+            content_hash = hashlib.blake2b(
+                "\x1f".join(values).encode(), digest_size=8).hexdigest()
+            
+            # Unchanged row: mark it present and skip dict construction
+            db_entry = db_index.get(question_hash) if db_index else None
+            if db_entry is not None and db_entry[1] == content_hash:
+                level_questions[question_hash] = None
+                stats['valid_questions'] += 1
+                continue
+            
+            # Store all question data (new or changed rows only)
+            csv_data = dict(zip(CONTENT_FIELDS, values))
+            csv_data['content_hash'] = content_hash
+            level_questions[question_hash] = csv_data
+            
+            stats['valid_questions'] += 1
+    
+    return level_questions, stats
+
+def load_csv_questions(csv_files: dict, db_index: dict = None) -> dict:
     """
     Load all questions from CSV files with validation.
-    Returns: {hash: {question_data}}
+    Returns: {hash: {question_data}}, where questions already in the
+    database with a matching content fingerprint map to None — no dict is
+    built for rows that will not be written.
     Skips invalid questions like setup script does.
     """
     csv_questions = {}
@@ -77,55 +331,28 @@ def load_csv_questions(csv_files: dict) -> dict:
         'skipped_duplicates': 0
     }
     
+    # The level files are independent and parsing is CPU-bound, so farm
+    # one worker process out per level and merge the results in order
     for level, filepath in csv_files.items():
         print(f"📂 Reading {filepath}...")
+    
+    with ProcessPoolExecutor(max_workers=len(csv_files)) as executor:
+        futures = [(level, executor.submit(_load_one_level, level, filepath, db_index))
+                   for level, filepath in csv_files.items()]
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        for level, future in futures:
+            level_questions, level_stats = future.result()
             
-            for row in reader:
-                stats['total_rows'] += 1
-                
-                # 1. Basic Validation - same as setup script
-                required = ['question_text', 'correct_option', 'option_a', 'topic']
-                if any(not row.get(field) for field in required):
-                    stats['skipped_missing_fields'] += 1
-                    continue
-                
-                # 2. Validate Correct Option - same as setup script
-                correct = row['correct_option'].strip().upper()
-                if correct not in ['A', 'B', 'C', 'D']:
-                    stats['skipped_invalid_option'] += 1
-                    continue
-                
-                # 3. Generate hash using setup script's method
-                q_text = row['question_text'].strip()
-                question_hash = generate_hash(level, q_text)
-                
-                # 4. Skip duplicates within CSV
+            for key in stats:
+                stats[key] += level_stats[key]
+            
+            # Dedupe across levels, same rule as the within-file check
+            for question_hash, csv_data in level_questions.items():
                 if question_hash in csv_questions:
                     stats['skipped_duplicates'] += 1
-                    continue
-                
-                # Store all question data
-                csv_questions[question_hash] = {
-                    'complete_sentence': row.get('complete_sentence', '').strip(),
-                    'question_text': q_text,
-                    'english_translation': row.get('english_translation', '').strip(),
-                    'hint': row.get('hint', '').strip(),
-                    'alternate_correct_responses': row.get('alternate_correct_responses', '').strip(),
-                    'option_a': row.get('option_a', '').strip(),
-                    'option_b': row.get('option_b', '').strip(),
-                    'option_c': row.get('option_c', '').strip(),
-                    'option_d': row.get('option_d', '').strip(),
-                    'correct_option': correct,
-                    'cefr_level': level,
-                    'topic': row.get('topic', '').strip(),
-                    'explanation': row.get('explanation', '').strip(),
-                    'resource': row.get('resource', '').strip(),
-                }
-                
-                stats['valid_questions'] += 1
+                    stats['valid_questions'] -= 1
+                else:
+                    csv_questions[question_hash] = csv_data
     
     # Print validation summary
     print(f"\n📊 CSV Validation Summary:")
@@ -140,49 +367,44 @@ def load_csv_questions(csv_files: dict) -> dict:
     
     return csv_questions
 
-def load_db_questions() -> dict:
+def load_db_index(conn) -> dict:
     """
-    Load all questions from database.
-    Returns: {hash: {id, question_data}}
+    Load a slim index of the questions in the database.
+    Returns: {hash_id: (id, content_hash)} — just enough to classify each
+    CSV row; the archival path copies full rows with INSERT...SELECT
+    without ever pulling them into Python.
     """
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT id, hash_id, complete_sentence, question_text, english_translation,
-               hint, alternate_correct_responses, option_a, option_b, option_c, option_d,
-               correct_option, cefr_level, topic, explanation, resource, created_at
-        FROM questions
-    """)
-    
-    db_questions = {}
-    for row in cursor.fetchall():
-        db_questions[row['hash_id']] = dict(row)
-    
-    conn.close()
-    return db_questions
 
-def compare_questions(csv_data: dict, db_data: dict) -> bool:
-    """Check if question data has changed (excluding id and hash)."""
-    # Compare all fields except id and hash_id
-    fields = ['complete_sentence', 'question_text', 'english_translation', 'hint',
-              'alternate_correct_responses', 'option_a', 'option_b', 'option_c', 'option_d',
-              'correct_option', 'cefr_level', 'topic', 'explanation', 'resource']
-    
-    for field in fields:
-        if csv_data.get(field, '') != db_data.get(field, ''):
-            return False
-    
-    return True
+    cursor.execute("SELECT hash_id, id, content_hash FROM questions")
+    # Iterate the cursor directly: rows stream in arraysize chunks instead
+    # of materializing an intermediate fetchall list
+    db_index = {hash_id: (question_id, content_hash)
+                for hash_id, question_id, content_hash in cursor}
+
+    return db_index
 
-def check_and_add_columns():
+def compare_questions(csv_data: dict, db_entry: tuple) -> bool:
+    """
+    Check if question data is unchanged by comparing the stored content
+    fingerprints (migrate_hashes backfills them for older databases)
+    instead of 14 individual field strings.
+    """
+    return csv_data.get('content_hash') == db_entry[1]
+
+def check_and_add_columns(conn):
     """Ensure archive tables exist."""
-    conn = sqlite3.connect(DB_FILE)
     cursor = conn.cursor()
     
-    # Ensure archive tables exist
-    cursor.execute("""
+    # Change-detection fingerprint column (added for older databases)
+    cursor.execute("PRAGMA table_info(questions)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if 'content_hash' not in columns:
+        cursor.execute("ALTER TABLE questions ADD COLUMN content_hash TEXT")
+    
+    # All unconditional DDL in one executescript: a single C-level call
+    # parses and runs the batch instead of a round-trip per statement
+    cursor.executescript("""
         CREATE TABLE IF NOT EXISTS archived_questions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             original_question_id INTEGER NOT NULL,
@@ -204,10 +426,8 @@ def check_and_add_columns():
             created_at TIMESTAMP,
             archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             removal_reason TEXT
-        )
-    """)
-    
-    cursor.execute("""
+        );
+
         CREATE TABLE IF NOT EXISTS archived_enhanced_performance (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             original_question_id INTEGER NOT NULL,
@@ -222,10 +442,8 @@ def check_and_add_columns():
             mastery_level REAL DEFAULT 0.0,
             history_string TEXT DEFAULT '',
             archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-    
-    cursor.execute("""
+        );
+
         CREATE TABLE IF NOT EXISTS archived_answer_history (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             original_answer_id INTEGER NOT NULL,
@@ -238,20 +456,47 @@ def check_and_add_columns():
             quiz_session_id TEXT,
             cefr_level TEXT NOT NULL,
             archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
+        );
+
+        CREATE TABLE IF NOT EXISTS question_update_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question_hash TEXT NOT NULL,
+            old_question_id INTEGER,
+            new_question_id INTEGER,
+            update_type TEXT NOT NULL,
+            timestamp DATETIME,
+            notes TEXT
+        );
+
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_questions_hash_id ON questions(hash_id);
+
+        CREATE INDEX IF NOT EXISTS idx_ep_qid ON enhanced_performance(question_id);
+
+        CREATE INDEX IF NOT EXISTS idx_ah_qid ON answer_history(question_id);
+
+        CREATE INDEX IF NOT EXISTS idx_qul_hash ON question_update_log(question_hash);
+
+        CREATE INDEX IF NOT EXISTS idx_qul_timestamp ON question_update_log(timestamp DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_level_topic ON questions(cefr_level, topic);
+
+        ANALYZE;
     """)
     
     conn.commit()
-    conn.close()
 
-def update_database(csv_questions: dict, db_questions: dict) -> dict:
+def update_database(conn, csv_questions: dict, db_index: dict) -> dict:
     """
     Update database with CSV data.
     Returns statistics about changes.
     """
-    conn = sqlite3.connect(DB_FILE)
+    # The shared connection is opened with isolation_level=None: we manage
+    # the transaction ourselves so the whole update is one BEGIN
+    # IMMEDIATE/COMMIT instead of an fsync per statement
     cursor = conn.cursor()
     
+    cursor.execute("BEGIN IMMEDIATE")
+    
     stats = {
         'unchanged': 0,
         'updated': 0,
@@ -262,243 +507,369 @@ def update_database(csv_questions: dict, db_questions: dict) -> dict:
     
     current_time = datetime.now().isoformat()
     
-    # Process CSV questions
-    for question_hash, csv_data in csv_questions.items():
-        try:
-            if question_hash in db_questions:
-                # Question exists - check if it needs updating
-                db_data = db_questions[question_hash]
-                
-                if compare_questions(csv_data, db_data):
+    # Per-row tracing goes through this buffer and is printed once at the
+    # end — one write instead of a stdout flush per changed row
+    log = []
+    
+    # hash_ids of questions not yet in the database, collected while the
+    # upsert generator runs so performance-row init can target just them
+    new_hashes = []
+    
+    # Audit rows for question_update_log, flushed in one executemany
+    log_rows = []
+    
+    # One upsert path: SQLite decides insert-vs-update on hash_id, and the
+    # WHERE guard turns re-applying an identical row into a no-op. Rows are
+    # still classified in Python (against the loaded index) for the stats.
+    # executemany accepts any iterable, so yield the parameter tuples
+    # lazily instead of materializing a second full-size list.
+    def gen_upsert_rows():
+        for question_hash, csv_data in csv_questions.items():
+            # None marks a row load_csv_questions already verified as unchanged
+            if csv_data is None:
+                stats['unchanged'] += 1
+                continue
+            
+            db_entry = db_index.get(question_hash)
+            
+            if db_entry is not None:
+                if compare_questions(csv_data, db_entry):
                     stats['unchanged'] += 1
-                else:
-                    # Update existing question
-                    cursor.execute("""
-                        UPDATE questions
-                        SET complete_sentence = ?, question_text = ?, english_translation = ?,
-                            hint = ?, alternate_correct_responses = ?,
-                            option_a = ?, option_b = ?, option_c = ?, option_d = ?,
-                            correct_option = ?, cefr_level = ?, topic = ?,
-                            explanation = ?, resource = ?
-                        WHERE hash_id = ?
-                    """, (
-                        csv_data['complete_sentence'],
-                        csv_data['question_text'],
-                        csv_data['english_translation'],
-                        csv_data['hint'],
-                        csv_data['alternate_correct_responses'],
-                        csv_data['option_a'],
-                        csv_data['option_b'],
-                        csv_data['option_c'],
-                        csv_data['option_d'],
-                        csv_data['correct_option'],
-                        csv_data['cefr_level'],
-                        csv_data['topic'],
-                        csv_data['explanation'],
-                        csv_data['resource'],
-                        question_hash
-                    ))
-                    
-                    stats['updated'] += 1
-                    print(f"  ✏️  Updated: {csv_data['question_text'][:50]}...")
+                    continue
+                stats['updated'] += 1
+                log_rows.append((question_hash, None, db_entry[0], 'updated',
+                                 current_time, 'Updated from CSV'))
+                if VERBOSE:
+                    log.append(f"  ✏️  Updated: {csv_data['question_text'][:50]}...")
             else:
-                # New question - add it
-                cursor.execute("""
-                    INSERT INTO questions (
-                        hash_id, complete_sentence, question_text, english_translation,
-                        hint, alternate_correct_responses,
-                        option_a, option_b, option_c, option_d,
-                        correct_option, cefr_level, topic,
-                        explanation, resource, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    question_hash,
-                    csv_data['complete_sentence'],
-                    csv_data['question_text'],
-                    csv_data['english_translation'],
-                    csv_data['hint'],
-                    csv_data['alternate_correct_responses'],
-                    csv_data['option_a'],
-                    csv_data['option_b'],
-                    csv_data['option_c'],
-                    csv_data['option_d'],
-                    csv_data['correct_option'],
-                    csv_data['cefr_level'],
-                    csv_data['topic'],
-                    csv_data['explanation'],
-                    csv_data['resource'],
-                    current_time
-                ))
-                
-                question_id = cursor.lastrowid
-                
-                # Initialize performance tracking
-                cursor.execute("""
-                    INSERT INTO enhanced_performance (question_id) VALUES (?)
-                """, (question_id,))
-                
                 stats['added'] += 1
-                print(f"  ➕ Added: {csv_data['question_text'][:50]}...")
+                new_hashes.append(question_hash)
+                if VERBOSE:
+                    log.append(f"  ➕ Added: {csv_data['question_text'][:50]}...")
+            
+            yield (
+                question_hash,
+                csv_data['content_hash'],
+                csv_data['complete_sentence'],
+                csv_data['question_text'],
+                csv_data['english_translation'],
+                csv_data['hint'],
+                csv_data['alternate_correct_responses'],
+                csv_data['option_a'],
+                csv_data['option_b'],
+                csv_data['option_c'],
+                csv_data['option_d'],
+                csv_data['correct_option'],
+                csv_data['cefr_level'],
+                csv_data['topic'],
+                csv_data['explanation'],
+                csv_data['resource'],
+                current_time
+            )
+    
+    # For big diffs, secondary index maintenance dominates the writes:
+    # drop rebuildable indexes up front and recreate them once at the end.
+    # Small diffs skip this — a rebuild would cost more than it saves. The
+    # unique hash_id index always stays: it is the UPSERT conflict target.
+    pending_writes = sum(1 for v in csv_questions.values() if v is not None)
+    dropped_indexes = []
+    if pending_writes >= 1000:
+        cursor.execute("""
+            SELECT name, sql FROM sqlite_master
+            WHERE type = 'index' AND sql IS NOT NULL
+              AND name != 'idx_questions_hash_id'
+              AND tbl_name IN ('questions', 'enhanced_performance', 'answer_history')
+        """)
+        for index_name, index_sql in cursor.fetchall():
+            dropped_indexes.append(index_sql)
+            cursor.execute(f"DROP INDEX {index_name}")
+    
+    try:
+        cursor.executemany("""
+            INSERT INTO questions (
+                hash_id, content_hash, complete_sentence, question_text,
+                english_translation, hint, alternate_correct_responses,
+                option_a, option_b, option_c, option_d,
+                correct_option, cefr_level, topic,
+                explanation, resource, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(hash_id) DO UPDATE SET
+                content_hash = excluded.content_hash,
+                complete_sentence = excluded.complete_sentence,
+                question_text = excluded.question_text,
+                english_translation = excluded.english_translation,
+                hint = excluded.hint,
+                alternate_correct_responses = excluded.alternate_correct_responses,
+                option_a = excluded.option_a,
+                option_b = excluded.option_b,
+                option_c = excluded.option_c,
+                option_d = excluded.option_d,
+                correct_option = excluded.correct_option,
+                cefr_level = excluded.cefr_level,
+                topic = excluded.topic,
+                explanation = excluded.explanation,
+                resource = excluded.resource
+            WHERE questions.content_hash IS NOT excluded.content_hash
+        """, gen_upsert_rows())
         
-        except Exception as e:
-            print(f"❌ Error processing {csv_data.get('question_text', 'unknown')}: {e}")
-            stats['errors'] += 1
-    
-    # Find removed questions (in DB but not in CSV)
-    removed_hashes = set(db_questions.keys()) - set(csv_questions.keys())
-    
+        # Initialize performance tracking for the newly added questions
+        # only, instead of re-scanning the whole questions table
+        if new_hashes:
+            placeholders = ",".join("?" * len(new_hashes))
+            cursor.execute(f"""
+                INSERT INTO enhanced_performance (question_id)
+                SELECT id FROM questions
+                WHERE hash_id IN ({placeholders})
+                  AND NOT EXISTS (SELECT 1 FROM enhanced_performance
+                                  WHERE question_id = questions.id)
+            """, new_hashes)
+            
+            # Log additions set-side: the new ids are only known after the
+            # upsert, so let SQLite pair them with their hashes
+            cursor.execute(f"""
+                INSERT INTO question_update_log
+                (question_hash, new_question_id, update_type, timestamp, notes)
+                SELECT hash_id, id, 'added', ?, 'Added from CSV'
+                FROM questions
+                WHERE hash_id IN ({placeholders})
+            """, [current_time] + new_hashes)
+        
+        if log_rows:
+            cursor.executemany(_SQL_LOG_INSERT, log_rows)
+    
+    except Exception as e:
+        print(f"❌ Error applying batched changes: {e}")
+        stats['errors'] += 1
+    
+    # Find removed questions (in DB but not in CSV). The CSV hashes are
+    # staged into a temp table so SQLite computes the difference with one
+    # indexed EXCEPT instead of Python building two full key sets.
+    cursor.execute("CREATE TEMP TABLE csv_hashes (hash_id TEXT PRIMARY KEY) WITHOUT ROWID")
+    cursor.executemany("INSERT OR IGNORE INTO csv_hashes VALUES (?)",
+                       ((question_hash,) for question_hash in csv_questions))
+    cursor.execute("SELECT hash_id FROM questions EXCEPT SELECT hash_id FROM csv_hashes")
+    removed_hashes = [row[0] for row in cursor.fetchall()]
+
     if removed_hashes:
         print(f"\n⚠️  Found {len(removed_hashes)} questions to remove")
-        
+
         # Safety check - don't remove more than 50% of questions
-        if len(removed_hashes) > len(db_questions) * 0.5:
-            print(f"❌ SAFETY: Refusing to remove {len(removed_hashes)}/{len(db_questions)} questions (>50%)")
+        if len(removed_hashes) > len(db_index) * 0.5:
+            print(f"❌ SAFETY: Refusing to remove {len(removed_hashes)}/{len(db_index)} questions (>50%)")
             print(f"   This seems like an error. No questions will be removed.")
         else:
-            for removed_hash in removed_hashes:
-                db_data = db_questions[removed_hash]
+            # Stage the doomed ids in a temp table so every archive, delete
+            # and log step is one set-based statement — seven statements
+            # total regardless of how many questions are removed
+            cursor.execute(
+                "CREATE TEMP TABLE archive_ids (question_id INTEGER PRIMARY KEY, question_hash TEXT)")
+            cursor.executemany(
+                "INSERT INTO archive_ids VALUES (?, ?)",
+                [(db_index[removed_hash][0], removed_hash) for removed_hash in removed_hashes])
+            
+            # Per-row removal tracing only when asked for: the query itself
+            # is part of the verbose path
+            if VERBOSE:
+                cursor.execute("""
+                    SELECT q.question_text FROM questions q
+                    JOIN archive_ids a ON q.id = a.question_id
+                """)
+                for (question_text,) in cursor.fetchall():
+                    log.append(f"  🗑️  Removed: {question_text[:50]}...")
+            
+            try:
+                # Archive questions
+                cursor.execute("""
+                    INSERT INTO archived_questions (
+                        original_question_id, hash_id, complete_sentence, question_text,
+                        english_translation, hint, alternate_correct_responses,
+                        option_a, option_b, option_c, option_d, correct_option,
+                        cefr_level, topic, explanation, resource,
+                        created_at, archived_at, removal_reason
+                    )
+                    SELECT q.id, q.hash_id, q.complete_sentence, q.question_text,
+                           q.english_translation, q.hint, q.alternate_correct_responses,
+                           q.option_a, q.option_b, q.option_c, q.option_d, q.correct_option,
+                           q.cefr_level, q.topic, q.explanation, q.resource,
+                           q.created_at, ?, 'No longer in CSV files'
+                    FROM questions q
+                    JOIN archive_ids a ON q.id = a.question_id
+                """, (current_time,))
+                
+                # Archive performance data
+                cursor.execute("""
+                    INSERT INTO archived_enhanced_performance (
+                        original_question_id, hash_id, correct_count, incorrect_count,
+                        partial_correct_count, freeform_correct_count,
+                        last_seen, last_answered_at, next_review_at,
+                        mastery_level, history_string, archived_at
+                    )
+                    SELECT ep.question_id, a.question_hash, ep.correct_count, ep.incorrect_count,
+                           ep.partial_correct_count, ep.freeform_correct_count,
+                           ep.last_seen, ep.last_answered_at, ep.next_review_at,
+                           ep.mastery_level, ep.history_string, ?
+                    FROM enhanced_performance ep
+                    JOIN archive_ids a ON ep.question_id = a.question_id
+                """, (current_time,))
                 
-                # Archive the question and its progress
-                try:
-                    # Archive question
-                    cursor.execute("""
-                        INSERT INTO archived_questions (
-                            original_question_id, hash_id, complete_sentence, question_text,
-                            english_translation, hint, alternate_correct_responses,
-                            option_a, option_b, option_c, option_d, correct_option,
-                            cefr_level, topic, explanation, resource,
-                            created_at, archived_at, removal_reason
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        db_data['id'], removed_hash,
-                        db_data['complete_sentence'], db_data['question_text'],
-                        db_data['english_translation'], db_data['hint'],
-                        db_data['alternate_correct_responses'],
-                        db_data['option_a'], db_data['option_b'],
-                        db_data['option_c'], db_data['option_d'],
-                        db_data['correct_option'], db_data['cefr_level'],
-                        db_data['topic'], db_data['explanation'],
-                        db_data['resource'], db_data.get('created_at'),
-                        current_time, 'No longer in CSV files'
-                    ))
-                    
-                    # Archive performance data
-                    cursor.execute("""
-                        INSERT INTO archived_enhanced_performance (
-                            original_question_id, hash_id, correct_count, incorrect_count,
-                            partial_correct_count, freeform_correct_count,
-                            last_seen, last_answered_at, next_review_at,
-                            mastery_level, history_string, archived_at
-                        )
-                        SELECT question_id, ?, correct_count, incorrect_count,
-                               partial_correct_count, freeform_correct_count,
-                               last_seen, last_answered_at, next_review_at,
-                               mastery_level, history_string, ?
-                        FROM enhanced_performance
-                        WHERE question_id = ?
-                    """, (removed_hash, current_time, db_data['id']))
-                    
-                    # Archive answer history
-                    cursor.execute("""
-                        INSERT INTO archived_answer_history (
-                            original_answer_id, original_question_id, hash_id,
-                            user_answer, correct_answer, is_correct,
-                            timestamp, quiz_session_id, cefr_level, archived_at
-                        )
-                        SELECT id, question_id, ?, user_answer, correct_answer,
-                               is_correct, timestamp, quiz_session_id, cefr_level, ?
-                        FROM answer_history
-                        WHERE question_id = ?
-                    """, (removed_hash, current_time, db_data['id']))
-                    
-                    # Delete from active tables
-                    cursor.execute("DELETE FROM answer_history WHERE question_id = ?", (db_data['id'],))
-                    cursor.execute("DELETE FROM enhanced_performance WHERE question_id = ?", (db_data['id'],))
-                    cursor.execute("DELETE FROM questions WHERE id = ?", (db_data['id'],))
-                    
-                    stats['removed'] += 1
-                    print(f"  🗑️  Removed: {db_data['question_text'][:50]}...")
+                # Archive answer history
+                cursor.execute("""
+                    INSERT INTO archived_answer_history (
+                        original_answer_id, original_question_id, hash_id,
+                        user_answer, correct_answer, is_correct,
+                        timestamp, quiz_session_id, cefr_level, archived_at
+                    )
+                    SELECT ah.id, ah.question_id, a.question_hash,
+                           ah.user_answer, ah.correct_answer, ah.is_correct,
+                           ah.timestamp, ah.quiz_session_id, ah.cefr_level, ?
+                    FROM answer_history ah
+                    JOIN archive_ids a ON ah.question_id = a.question_id
+                """, (current_time,))
+                
+                # Delete from active tables, one statement per table
+                cursor.execute(
+                    "DELETE FROM answer_history WHERE question_id IN (SELECT question_id FROM archive_ids)")
+                cursor.execute(
+                    "DELETE FROM enhanced_performance WHERE question_id IN (SELECT question_id FROM archive_ids)")
+                cursor.execute(
+                    "DELETE FROM questions WHERE id IN (SELECT question_id FROM archive_ids)")
                 
-                except Exception as e:
-                    print(f"❌ Error removing question {db_data['id']}: {e}")
-                    stats['errors'] += 1
+                cursor.execute("""
+                    INSERT INTO question_update_log
+                    (question_hash, old_question_id, update_type, timestamp, notes)
+                    SELECT question_hash, question_id, 'archived', ?, 'No longer in CSV files'
+                    FROM archive_ids
+                """, (current_time,))
+                
+                stats['removed'] = len(removed_hashes)
+            
+            except Exception as e:
+                print(f"❌ Error removing questions: {e}")
+                stats['errors'] += 1
+    
+    # Rebuild whatever was dropped for the bulk path, inside the same
+    # transaction so a failure rolls everything back together
+    for index_sql in dropped_indexes:
+        cursor.execute(index_sql)
+    
+    # Atomic check-and-commit: probe for orphans while the dirtied pages
+    # are still hot, and refuse to commit a broken state
+    has_orphan_perf, has_orphan_history = cursor.execute(_SQL_ORPHAN_EXISTS).fetchone()
+    if has_orphan_perf or has_orphan_history:
+        cursor.execute("ROLLBACK")
+        # The writes were discarded, so the mutation counts must not feed
+        # the report's delta-derived totals
+        stats['unchanged'] = stats['updated'] = stats['added'] = stats['removed'] = 0
+        stats['errors'] += 1
+        print("❌ Orphaned progress records detected — update rolled back")
+    else:
+        cursor.execute("COMMIT")
     
-    conn.commit()
-    conn.close()
+    if log:
+        print("\n".join(log))
     
     return stats
 
-def verify_integrity() -> bool:
+def verify_integrity(conn) -> bool:
     """Verify database integrity after update."""
-    conn = sqlite3.connect(DB_FILE)
-    cursor = conn.cursor()
+    # EXISTS first: on a healthy database each probe stops at the first
+    # row instead of counting every record; the full counts are only
+    # computed when there is actually something to report
+    has_orphan_perf, has_orphan_history = conn.execute(_SQL_ORPHAN_EXISTS).fetchone()
     
-    # Check for orphaned performance records
-    cursor.execute("""
-        SELECT COUNT(*) FROM enhanced_performance ep
-        LEFT JOIN questions q ON ep.question_id = q.id
-        WHERE q.id IS NULL
-    """)
-    orphaned = cursor.fetchone()[0]
+    if not has_orphan_perf and not has_orphan_history:
+        return True
     
-    conn.close()
+    orphaned_perf, orphaned_history = conn.execute(_SQL_ORPHAN_COUNTS).fetchone()
     
-    if orphaned > 0:
-        print(f"⚠️  Warning: {orphaned} orphaned performance records found")
-        return False
+    if orphaned_perf > 0:
+        print(f"⚠️  Warning: {orphaned_perf} orphaned performance records found")
+    if orphaned_history > 0:
+        print(f"⚠️  Warning: {orphaned_history} orphaned answer history records found")
     
-    return True
+    return orphaned_perf == 0 and orphaned_history == 0
 
-def generate_report(stats: dict, csv_files: dict):
-    """Generate update report."""
-    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
-        f.write("=" * 70 + "\n")
-        f.write("ITALIAN QUIZ DATABASE UPDATE REPORT\n")
-        f.write("=" * 70 + "\n")
-        f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        
-        f.write("FILES PROCESSED:\n")
-        for level, filepath in csv_files.items():
-            f.write(f"  {level}: {filepath}\n")
-        
-        f.write(f"\nSTATISTICS:\n")
-        f.write(f"  Unchanged questions: {stats['unchanged']}\n")
-        f.write(f"  Updated questions: {stats['updated']}\n")
-        f.write(f"  Added questions: {stats['added']}\n")
-        f.write(f"  Removed questions: {stats['removed']}\n")
-        f.write(f"  Errors: {stats['errors']}\n")
-        
-        # Get final counts
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) FROM questions")
-        total_questions = cursor.fetchone()[0]
-        
-        cursor.execute("SELECT COUNT(*) FROM archived_questions")
-        total_archived = cursor.fetchone()[0]
-        
-        cursor.execute("""
-            SELECT COUNT(*) FROM enhanced_performance
-            WHERE correct_count > 0 OR incorrect_count > 0
-        """)
-        questions_with_progress = cursor.fetchone()[0]
-        
-        conn.close()
-        
-        f.write(f"\nCURRENT DATABASE:\n")
-        f.write(f"  Active questions: {total_questions}\n")
-        f.write(f"  Archived questions: {total_archived}\n")
-        f.write(f"  Questions with progress: {questions_with_progress}\n")
-        
-        f.write("=" * 70 + "\n")
+def generate_report(stats: dict, csv_files: dict, conn, pre_counts=None):
+    """
+    Generate update report. pre_counts, when given, are the
+    _SQL_REPORT_COUNTS values captured before the update; the final
+    figures are then derived from the stats deltas instead of re-counting
+    the tables.
+    """
+    parts = []
+    append = parts.append
+    
+    append(SEP + "\n")
+    append("ITALIAN QUIZ DATABASE UPDATE REPORT\n")
+    append(SEP + "\n")
+    append(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+    
+    append("FILES PROCESSED:\n")
+    for level, filepath in csv_files.items():
+        append(f"  {level}: {filepath}\n")
+    
+    append(f"\nSTATISTICS:\n")
+    append(f"  Unchanged questions: {stats['unchanged']}\n")
+    append(f"  Updated questions: {stats['updated']}\n")
+    append(f"  Added questions: {stats['added']}\n")
+    append(f"  Removed questions: {stats['removed']}\n")
+    append(f"  Errors: {stats['errors']}\n")
+    
+    # Get final counts: derive from the pre-update snapshot plus the
+    # writes we just made, or fall back to counting
+    if pre_counts is not None:
+        total_questions = pre_counts[0] + stats['added'] - stats['removed']
+        total_archived = pre_counts[1] + stats['removed']
+        # Archiving moves progress rows out of enhanced_performance, so the
+        # pre-update figure drifts after removals; recount just this one
+        questions_with_progress = conn.execute(_SQL_PROGRESS_COUNT).fetchone()[0]
+    else:
+        (total_questions, total_archived,
+         questions_with_progress) = conn.execute(_SQL_REPORT_COUNTS).fetchone()
+    
+    append(f"\nCURRENT DATABASE:\n")
+    append(f"  Active questions: {total_questions}\n")
+    append(f"  Archived questions: {total_archived}\n")
+    append(f"  Questions with progress: {questions_with_progress}\n")
+    
+    append(SEP + "\n")
+    
+    # Encode once and write the bytes in one call: skips TextIOWrapper's
+    # per-write locking/encoding layer entirely. Writing to a temp file
+    # and renaming over the old report keeps it whole if we're killed
+    # mid-write — readers only ever see the previous or the new version.
+    tmp_file = REPORT_FILE + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write("".join(parts).encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, REPORT_FILE)
     
     print(f"✅ Report saved to: {REPORT_FILE}")
 
+def show_recent_changes(conn, limit: int = 15):
+    """Show the newest question_update_log entries after an update."""
+    rows = conn.execute(_SQL_RECENT_CHANGES, (limit,)).fetchall()
+    
+    if not rows:
+        return
+    
+    lines = ["", "RECENT CHANGES:"]
+    for timestamp, update_type, q_hash, old_id, new_id, notes in rows:
+        line = _RECENT_ROW.format(
+            ts=(timestamp or '')[:19], ut=update_type, qh=q_hash[:8],
+            oid=old_id or '-', nid=new_id or '-')
+        if notes:
+            line += f" | {notes}"
+        lines.append(line)
+    
+    # Single buffered write instead of a print per row
+    sys.stdout.write("\n".join(lines) + "\n")
+
 def main():
-    print("=" * 70)
+    print(SEP)
     print("ITALIAN QUIZ DATABASE UPDATE")
-    print("=" * 70)
+    print(SEP)
     print()
     
     # Find CSV files
@@ -511,81 +882,133 @@ def main():
     
     print(f"Found CSV files for levels: {', '.join(csv_files.keys())}\n")
     
-    # Ensure archive tables exist
-    check_and_add_columns()
-    
-    # Create backup
-    backup_file = create_backup()
-    if not backup_file:
-        response = input("No backup created. Continue anyway? (yes/no): ")
-        if response.lower() not in ['yes', 'y']:
-            print("Update cancelled.")
-            return
+    # One connection for every phase: schema parsing, the WAL handles and
+    # the page cache survive across steps instead of being redone per open.
+    # closing() guarantees the handle is released on any exit path.
+    with closing(sqlite3.connect(DB_FILE, isolation_level=None)) as conn:
+        conn.row_factory = sqlite3.Row
+    
+        # Tune once at open: WAL + NORMAL cuts fsyncs to one per transaction,
+        # temp tables stay in RAM, and a 64 MB page cache plus a 256 MB mmap
+        # window keep the whole database out of read() syscalls
+        conn.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-64000;
+            PRAGMA mmap_size=268435456;
+        """)
     
-    print()
+        # Ensure archive tables exist
+        check_and_add_columns(conn)
     
-    # Load data
-    print("📖 Loading CSV questions...")
-    csv_questions = load_csv_questions(csv_files)
-    print(f"   Found {len(csv_questions)} questions in CSV files\n")
+        # Create backup
+        backup_file = create_backup(conn)
     
-    print("📖 Loading database questions...")
-    db_questions = load_db_questions()
-    print(f"   Found {len(db_questions)} questions in database\n")
+        # Roll any old-scheme hashes before diffing against the CSVs
+        migrate_hashes(conn)
+        if not backup_file:
+            response = input("No backup created. Continue anyway? (yes/no): ")
+            if response.lower() not in ['yes', 'y']:
+                print("Update cancelled.")
+                return
     
-    # Show preview
-    print("PREVIEW:")
-    matching = len(set(csv_questions.keys()) & set(db_questions.keys()))
-    new = len(set(csv_questions.keys()) - set(db_questions.keys()))
-    removed = len(set(db_questions.keys()) - set(csv_questions.keys()))
+        print()
     
-    print(f"  Matching questions: {matching}")
-    print(f"  New questions: {new}")
-    print(f"  Removed questions: {removed}")
-    print()
+        # Load data
+        print("📖 Loading database questions...")
+        db_index = load_db_index(conn)
+        print(f"   Found {len(db_index)} questions in database\n")
+
+        print("📖 Loading CSV questions...")
+        csv_questions = load_csv_questions(csv_files, db_index)
+        print(f"   Found {len(csv_questions)} questions in CSV files\n")
+    
+        # Show preview
+        matching = len(set(csv_questions.keys()) & set(db_index.keys()))
+        new = len(set(csv_questions.keys()) - set(db_index.keys()))
+        removed = len(set(db_index.keys()) - set(csv_questions.keys()))
+
+        # One buffered write for the preview block, like the summary below
+        preview = [
+            "PREVIEW:",
+            f"  Matching questions: {matching}",
+            f"  New questions: {new}",
+            f"  Removed questions: {removed}",
+            "",
+        ]
+        if removed > 0:
+            preview += [
+                f"⚠️  Warning: {removed} questions will be archived (not deleted)",
+                "   Their progress will be preserved in archived tables",
+                "",
+            ]
+        sys.stdout.write("\n".join(preview) + "\n")
+
+        response = input("Proceed with update? (yes/no): ")
+        if response.lower() not in ['yes', 'y']:
+            print("Update cancelled.")
+            return
     
-    # Confirm
-    if removed > 0:
-        print(f"⚠️  Warning: {removed} questions will be archived (not deleted)")
-        print("   Their progress will be preserved in archived tables")
-        print()
+        print("\n" + SEP)
+        print("UPDATING DATABASE...")
+        print(SEP + "\n")
+    
+        # Snapshot the report counts now so the summary can be derived from
+        # deltas instead of re-scanning the tables afterwards
+        pre_counts = conn.execute(_SQL_REPORT_COUNTS).fetchone()
+    
+        # Perform update
+        stats = update_database(conn, csv_questions, db_index)
+    
+        # One buffered write for the whole summary block
+        sys.stdout.write("\n".join([
+            "",
+            SEP,
+            "UPDATE COMPLETE",
+            SEP,
+            f"  Unchanged: {stats['unchanged']}",
+            f"  Updated: {stats['updated']}",
+            f"  Added: {stats['added']}",
+            f"  Removed: {stats['removed']}",
+            f"  Errors: {stats['errors']}",
+            "",
+        ]) + "\n")
+    
+        # Read-only tail: a single deferred transaction gives the checks and
+        # report one consistent snapshot and one implicit BEGIN/COMMIT instead
+        # of autocommit bookkeeping per SELECT
+        conn.execute("BEGIN DEFERRED")
+    
+        # Verify integrity
+        if verify_integrity(conn):
+            print("✅ Database integrity verified")
+        else:
+            print("⚠️  Database integrity issues detected")
+            if backup_file:
+                print(f"   You can restore from: {backup_file}")
     
-    response = input("Proceed with update? (yes/no): ")
-    if response.lower() not in ['yes', 'y']:
-        print("Update cancelled.")
-        return
+        # Generate report
+        generate_report(stats, csv_files, conn, pre_counts)
+        show_recent_changes(conn)
     
-    print("\n" + "=" * 70)
-    print("UPDATING DATABASE...")
-    print("=" * 70 + "\n")
-    
-    # Perform update
-    stats = update_database(csv_questions, db_questions)
-    
-    print("\n" + "=" * 70)
-    print("UPDATE COMPLETE")
-    print("=" * 70)
-    print(f"  Unchanged: {stats['unchanged']}")
-    print(f"  Updated: {stats['updated']}")
-    print(f"  Added: {stats['added']}")
-    print(f"  Removed: {stats['removed']}")
-    print(f"  Errors: {stats['errors']}")
-    print()
+        conn.execute("COMMIT")
     
-    # Verify integrity
-    if verify_integrity():
-        print("✅ Database integrity verified")
-    else:
-        print("⚠️  Database integrity issues detected")
-        if backup_file:
-            print(f"   You can restore from: {backup_file}")
+        # Refresh planner statistics so the quiz app benefits from the new
+        # row distribution; near-free since SQLite only re-analyzes what changed
+        conn.execute("PRAGMA optimize")
     
-    # Generate report
-    generate_report(stats, csv_files)
+        # Machine-readable one-liner for CI/log scrapers, opt-in
+        if '--json' in sys.argv:
+            print(json.dumps({
+                **stats,
+                'active_questions': pre_counts[0] + stats['added'] - stats['removed'],
+                'archived_questions': pre_counts[1] + stats['removed'],
+            }))
     
-    print("\n✅ Update complete!")
-    if backup_file:
-        print(f"💾 Backup: {backup_file}")
+        print("\n✅ Update complete!")
+        if backup_file:
+            print(f"💾 Backup: {backup_file}")
 
 if __name__ == "__main__":
     main()